@@ -0,0 +1,265 @@
+"""Provides compiled simulation loops for preset strategies and arms.
+
+If [numba](https://numba.pydata.org/) is installed, trials of the preset
+epsilon-greedy, random, UCB1, and Beta Thompson sampling strategies on Bernoulli or
+Gaussian bandits are run with just-in-time compiled loops. Otherwise, or for any other
+strategy or arm, trials fall back to the regular simulation loop.
+
+Per-step updates of agent statistics are also compiled if numba is installed, and run
+as plain Python functions otherwise.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from numpy.random import Generator
+from numpy.typing import NDArray
+
+from mabby.strategies import (
+    BetaTSStrategy,
+    EpsilonGreedyStrategy,
+    RandomStrategy,
+    UCB1Strategy,
+)
+
+if TYPE_CHECKING:
+    from mabby.bandit import Bandit
+    from mabby.strategies import Strategy
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    NUMBA_AVAILABLE = False
+
+    def njit(*_: Any, **__: Any) -> Callable[[Any], Any]:  # type: ignore[no-redef]
+        return lambda func: func
+
+
+_BERNOULLI = 0
+_GAUSSIAN = 1
+
+
+@njit(cache=True)
+def _random_argmax(values: NDArray[np.float64], rng: Generator) -> int:
+    best = values.max()
+    num_best = 0
+    for value in values:
+        if value == best:
+            num_best += 1
+    target = rng.integers(0, num_best) if num_best > 1 else 0
+    for i in range(len(values)):
+        if values[i] == best:
+            if target == 0:
+                return i
+            target -= 1
+    return -1
+
+
+@njit(cache=True)
+def _play_sampled(
+    dist: int,
+    loc: NDArray[np.float64],
+    scale: NDArray[np.float64],
+    choice: int,
+    variate: float,
+) -> float:
+    if dist == _BERNOULLI:
+        return 1.0 if variate < loc[choice] else 0.0
+    return loc[choice] + scale[choice] * variate
+
+
+@njit(cache=True)
+def _run_semi_uniform_trial(
+    Qs: NDArray[np.float64],
+    Ns: NDArray[np.uint32],
+    eps: float,
+    always_explore: bool,
+    dist: int,
+    loc: NDArray[np.float64],
+    scale: NDArray[np.float64],
+    agent_rng: Generator,
+    variates: NDArray[np.float64],
+    choices: NDArray[np.int64],
+    rewards: NDArray[np.float64],
+) -> None:
+    for step in range(len(choices)):
+        # the random strategy explores without drawing, unlike e.g. eps-greedy at eps=1
+        if always_explore or agent_rng.random() < eps:
+            choice = agent_rng.integers(0, len(Qs))
+        else:
+            choice = _random_argmax(Qs, agent_rng)
+        reward = _play_sampled(dist, loc, scale, choice, variates[step])
+        Ns[choice] += 1
+        Qs[choice] += (reward - Qs[choice]) / Ns[choice]
+        choices[step] = choice
+        rewards[step] = reward
+
+
+@njit(cache=True)
+def _run_ucb1_trial(
+    Qs: NDArray[np.float64],
+    Ns: NDArray[np.uint32],
+    t: int,
+    alpha: float,
+    dist: int,
+    loc: NDArray[np.float64],
+    scale: NDArray[np.float64],
+    agent_rng: Generator,
+    variates: NDArray[np.float64],
+    choices: NDArray[np.int64],
+    rewards: NDArray[np.float64],
+) -> int:
+    for step in range(len(choices)):
+        if t < len(Qs):
+            choice = t
+        else:
+            choice = _random_argmax(Qs + alpha * np.sqrt(np.log(t) / Ns), agent_rng)
+        reward = _play_sampled(dist, loc, scale, choice, variates[step])
+        t += 1
+        Ns[choice] += 1
+        Qs[choice] += (reward - Qs[choice]) / Ns[choice]
+        choices[step] = choice
+        rewards[step] = reward
+    return t
+
+
+@njit(cache=True)
+def _run_beta_ts_trial(
+    a: NDArray[np.float64],
+    b: NDArray[np.float64],
+    p: NDArray[np.float64],
+    general: bool,
+    agent_rng: Generator,
+    variates: NDArray[np.float64],
+    choices: NDArray[np.int64],
+    rewards: NDArray[np.float64],
+) -> None:
+    samples = np.empty(len(a), dtype=np.float64)
+    for step in range(len(choices)):
+        for i in range(len(a)):
+            samples[i] = agent_rng.beta(a[i], b[i])
+        choice = np.argmax(samples)
+        reward = 1.0 if variates[step] < p[choice] else 0.0
+        pseudo_reward = agent_rng.binomial(1, reward) if general else reward
+        a[choice] += pseudo_reward
+        b[choice] += 1 - pseudo_reward
+        choices[step] = choice
+        rewards[step] = reward
+
+
+@njit(cache=True)
+def update_step(
+    counts: NDArray[np.float64],
+    regret: NDArray[np.float64],
+    rewards: NDArray[np.float64],
+    optimality: NDArray[np.float64],
+    means: NDArray[np.float64],
+    best_mean: float,
+    step: int,
+    choice: int,
+    reward: float,
+) -> None:
+    """Updates agent statistics arrays for a single simulation step.
+
+    Args:
+        counts: The number of updates to each step.
+        regret: The summed regret at each step.
+        rewards: The summed rewards at each step.
+        optimality: The summed optimality at each step.
+        means: The means of the bandit's arms.
+        best_mean: The greatest mean of any arm.
+        step: The number of the step.
+        choice: The choice made by the agent.
+        reward: The reward observed by the agent.
+    """
+    chosen_mean = means[choice]
+    regret[step] += best_mean - chosen_mean
+    rewards[step] += reward
+    optimality[step] += chosen_mean == best_mean
+    counts[step] += 1
+
+
+def run_trial(
+    strategy: Strategy, bandit: Bandit, steps: int, rng: Generator
+) -> tuple[NDArray[np.int64], NDArray[np.float64]] | None:
+    """Runs a trial of a primed strategy with a compiled loop.
+
+    The strategy's parameter estimates are updated in place, exactly as if it were
+    run through an agent one step at a time.
+
+    Args:
+        strategy: The primed strategy to run.
+        bandit: The bandit to run the strategy on.
+        steps: The number of steps in the trial.
+        rng: The random number generator for the strategy's choices.
+
+    Returns:
+        A tuple with the arrays of choices and rewards for each step, or ``None`` if
+        no compiled loop is available for the strategy and bandit.
+    """
+    if not NUMBA_AVAILABLE or bandit._dist is None:
+        return None
+    if bandit._dist == "bernoulli":
+        dist, loc = _BERNOULLI, bandit._params["p"]
+        scale = np.zeros_like(loc)
+    else:
+        dist, loc = _GAUSSIAN, bandit._params["loc"]
+        scale = bandit._params["scale"]
+    if not (
+        type(strategy) is EpsilonGreedyStrategy
+        or type(strategy) is RandomStrategy
+        or type(strategy) is UCB1Strategy
+        or (type(strategy) is BetaTSStrategy and dist == _BERNOULLI)
+    ):
+        return None
+
+    # rewards come from the same per-step variates as in the regular simulation loop
+    variates = bandit.sample(steps)
+    if variates is None:  # pragma: no cover
+        return None
+    choices = np.empty(steps, dtype=np.int64)
+    rewards = np.empty(steps, dtype=np.float64)
+    if type(strategy) is EpsilonGreedyStrategy or type(strategy) is RandomStrategy:
+        _run_semi_uniform_trial(
+            strategy._Qs,
+            strategy._Ns,
+            float(strategy.effective_eps()),
+            type(strategy) is RandomStrategy,
+            dist,
+            loc,
+            scale,
+            rng,
+            variates,
+            choices,
+            rewards,
+        )
+    elif type(strategy) is UCB1Strategy:
+        strategy._t = _run_ucb1_trial(
+            strategy._Qs,
+            strategy._Ns,
+            strategy._t,
+            float(strategy.alpha),
+            dist,
+            loc,
+            scale,
+            rng,
+            variates,
+            choices,
+            rewards,
+        )
+    elif type(strategy) is BetaTSStrategy:
+        _run_beta_ts_trial(
+            strategy._a,
+            strategy._b,
+            loc,
+            strategy.general,
+            rng,
+            variates,
+            choices,
+            rewards,
+        )
+    return choices, rewards
@@ -60,6 +60,25 @@ class Agent:
         self._rng = rng
         self.strategy.prime(k, steps)
 
+    def load_state(self, other: Agent) -> None:
+        """Loads the state of a copy of the agent, e.g. one run in another process.
+
+        The agent's strategy loads the state of the copy's strategy with
+        [`Strategy.load_state`][mabby.strategies.strategy.Strategy.load_state]. If the
+        strategy does not support that, it is replaced by the copy's strategy instead.
+
+        Args:
+            other: The copy of the agent to load the state of.
+        """
+        try:
+            self.strategy.load_state(other.strategy)
+        except NotImplementedError:
+            self.strategy = other.strategy
+        self._primed = other._primed
+        self._choice = other._choice
+        if other._primed:
+            self._rng = other._rng
+
     def choose(self) -> int:
         """Returns the agent's next choice based on its strategy.
 
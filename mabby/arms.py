@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
+import numpy as np
 from numpy.random import Generator
+from numpy.typing import NDArray
 from overrides import EnforceOverrides, override
 
 from mabby.bandit import Bandit
@@ -33,6 +35,21 @@ class Arm(ABC, EnforceOverrides):
             The sampled reward from the arm's reward distribution.
         """
 
+    def play_batch(self, rng: Generator, n: int) -> NDArray[np.float64]:
+        """Plays the arm repeatedly and samples a batch of rewards.
+
+        By default, the arm is played ``n`` times in a row. Subclasses can override
+        this to sample all rewards at once.
+
+        Args:
+            rng: A random number generator.
+            n: The number of times to play the arm.
+
+        Returns:
+            An array of the sampled rewards.
+        """
+        return np.array([self.play(rng) for _ in range(n)], dtype=np.float64)
+
     @property
     @abstractmethod
     def mean(self) -> float:
@@ -64,10 +81,10 @@ class Arm(ABC, EnforceOverrides):
         Returns:
             A bandit with the specified arms.
         """
-        params_dicts = [dict(zip(kwargs, t)) for t in zip(*kwargs.values())]
-        if len(params_dicts) == 0:
+        arms = [cls(**dict(zip(kwargs, t))) for t in zip(*kwargs.values())]
+        if len(arms) == 0:
             raise ValueError("insufficient parameters to create an arm")
-        return Bandit([cls(**params) for params in params_dicts], rng, seed)
+        return Bandit(arms, rng, seed)
 
 
 class BernoulliArm(Arm):
@@ -88,7 +105,11 @@ class BernoulliArm(Arm):
 
     @override
     def play(self, rng: Generator) -> float:
-        return rng.binomial(1, self.p)
+        return float(rng.random() < self.p)
+
+    @override
+    def play_batch(self, rng: Generator, n: int) -> NDArray[np.float64]:
+        return (rng.random(n) < self.p).astype(np.float64)
 
     @property
     @override
@@ -122,6 +143,10 @@ class GaussianArm(Arm):
     def play(self, rng: Generator) -> float:
         return rng.normal(self.loc, self.scale)
 
+    @override
+    def play_batch(self, rng: Generator, n: int) -> NDArray[np.float64]:
+        return rng.normal(self.loc, self.scale, size=n)
+
     @property
     @override
     def mean(self) -> float:
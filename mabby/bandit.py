@@ -2,15 +2,15 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
 import numpy as np
 from numpy.random import Generator
+from numpy.typing import NDArray
 
 if TYPE_CHECKING:
     from mabby.arms import Arm
-from mabby.utils import random_argmax
 
 
 class Bandit:
@@ -33,6 +33,33 @@ class Bandit:
         """
         self._arms = arms
         self._rng = rng if rng else np.random.default_rng(seed)
+        self._play_fns = [arm.play for arm in arms]
+        self._dist, self._params = self._pack_params(arms)
+        self._means = np.fromiter(
+            (arm.mean for arm in arms), dtype=np.float64, count=len(arms)
+        )
+        self._means.flags.writeable = False
+        self._best_mean = np.max(self._means, initial=-np.inf)
+        self._best_arms = np.flatnonzero(self._means == self._best_mean)
+
+    @staticmethod
+    def _pack_params(
+        arms: list[Arm],
+    ) -> tuple[str | None, dict[str, NDArray[np.float64]]]:
+        from mabby.arms import BernoulliArm, GaussianArm
+
+        if len(arms) == 0:
+            return None, {}
+        bernoulli_arms = [arm for arm in arms if type(arm) is BernoulliArm]
+        if len(bernoulli_arms) == len(arms):
+            return "bernoulli", {"p": np.array([arm.p for arm in bernoulli_arms])}
+        gaussian_arms = [arm for arm in arms if type(arm) is GaussianArm]
+        if len(gaussian_arms) == len(arms):
+            return "gaussian", {
+                "loc": np.array([arm.loc for arm in gaussian_arms]),
+                "scale": np.array([arm.scale for arm in gaussian_arms]),
+            }
+        return None, {}
 
     def __len__(self) -> int:
         """Returns the number of arms."""
@@ -53,7 +80,7 @@ class Bandit:
         """
         return self._arms[i]
 
-    def __iter__(self) -> Iterable[Arm]:
+    def __iter__(self) -> Iterator[Arm]:
         """Returns an iterator over the bandit's arms."""
         return iter(self._arms)
 
@@ -66,16 +93,64 @@ class Bandit:
         Returns:
             The reward from playing the arm.
         """
-        return self[i].play(self._rng)
+        return self._play_fns[i](self._rng)
+
+    def sample(self, steps: int) -> NDArray[np.float64] | None:
+        """Samples the random variates that determine rewards for a number of steps.
+
+        Variates can only be sampled ahead of time if all arms are
+        [`BernoulliArm`][mabby.arms.BernoulliArm]s or all arms are
+        [`GaussianArm`][mabby.arms.GaussianArm]s, whose reward distributions do not
+        change between plays. Otherwise, arms must be played one step at a time.
+
+        A single variate is sampled per step and shared by all arms, i.e. a uniform
+        variate for Bernoulli arms and a standard normal variate for Gaussian arms.
+        Use [`play_sampled`][mabby.bandit.Bandit.play_sampled] to turn the variate of
+        a step into the reward from the arm played at that step.
+
+        Args:
+            steps: The number of steps to sample variates for.
+
+        Returns:
+            An array of shape ``(steps,)`` with the variate for each step, or ``None``
+            if the variates cannot be sampled ahead of time.
+        """
+        if self._dist == "bernoulli":
+            return self._rng.random(steps)
+        if self._dist == "gaussian":
+            return self._rng.standard_normal(steps)
+        return None
+
+    def play_sampled(self, i: int, variate: float) -> float:
+        """Plays an arm by index with a variate sampled ahead of time.
+
+        Args:
+            i: The index of the arm to play.
+            variate: A variate for the step from [`sample`][mabby.bandit.Bandit.sample].
+
+        Returns:
+            The reward from playing the arm.
+        """
+        if self._dist == "bernoulli":
+            return float(variate < self._params["p"][i])
+        return float(self._params["loc"][i] + self._params["scale"][i] * variate)
 
     @property
-    def means(self) -> list[float]:
+    def means(self) -> NDArray[np.float64]:
         """The means of the arms.
 
+        The means are computed once when the bandit is created and returned as a
+        read-only array.
+
         Returns:
             An array of the means of each arm.
         """
-        return [arm.mean for arm in self._arms]
+        return self._means
+
+    @property
+    def max_mean(self) -> float:
+        """The greatest mean of any arm."""
+        return float(self._best_mean)
 
     def best_arm(self) -> int:
         """Returns the index of the optimal arm.
@@ -86,7 +161,9 @@ class Bandit:
         Returns:
             The index of the optimal arm.
         """
-        return random_argmax(self.means, rng=self._rng)
+        if self._best_arms.size == 1:
+            return int(self._best_arms[0])
+        return int(self._best_arms[self._rng.integers(self._best_arms.size)])
 
     def is_opt(self, choice: int) -> bool:
         """Returns the optimality of a given choice.
@@ -97,7 +174,7 @@ class Bandit:
         Returns:
             ``True`` if the arm has the greatest expected reward, ``False`` otherwise.
         """
-        return np.max(self.means) == self._arms[choice].mean
+        return bool(self._means[choice] == self._best_mean)
 
     def regret(self, choice: int) -> float:
         """Returns the regret from a given choice.
@@ -111,4 +188,4 @@ class Bandit:
         Returns:
             The computed regret value.
         """
-        return np.max(self.means) - self._arms[choice].mean
+        return float(self._best_mean - self._means[choice])
@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
+import os
+import pickle
+import warnings
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from itertools import zip_longest
 from typing import TYPE_CHECKING
 
 import numpy as np
 from numpy.random import Generator
+from numpy.typing import NDArray
 
+from mabby import _kernels
 from mabby.agent import Agent
+from mabby.bandit import Bandit
 from mabby.exceptions import SimulationUsageError
 from mabby.stats import AgentStats, Metric, SimulationStats
+from mabby.utils import spawn_rngs
 
 if TYPE_CHECKING:
-    from mabby.bandit import Bandit
     from mabby.strategies import Strategy
 
 
@@ -78,7 +85,11 @@ class Simulation:
         raise SimulationUsageError("one of agents or strategies must be supplied")
 
     def run(
-        self, trials: int, steps: int, metrics: Iterable[Metric] | None = None
+        self,
+        trials: int,
+        steps: int,
+        metrics: Iterable[Metric] | None = None,
+        n_jobs: int = 1,
     ) -> SimulationStats:
         """Runs a simulation.
 
@@ -87,20 +98,95 @@ class Simulation:
 
         If ``metrics`` is not specified, all available metrics are tracked by default.
 
+        If ``n_jobs`` is greater than 1, the trials of each agent are split into batches
+        that are run in separate worker processes, each with an independent random
+        number generator spawned from the simulation's. Agents and strategies must be
+        picklable to be run in parallel; otherwise, a warning is issued and the trials
+        are run sequentially. After a parallel run, each agent loads the state left by
+        its last trial with [`Agent.load_state`][mabby.agent.Agent.load_state].
+
         Args:
             trials: The number of trials in the simulation.
             steps: The number of steps in a trial.
             metrics: A list of metrics to collect.
+            n_jobs: The number of worker processes to run trials in. If ``-1``, all
+                available CPUs are used.
 
         Returns:
             A ``SimulationStats`` object with the results of the simulation.
+
+        Raises:
+            ValueError: If ``n_jobs`` is neither positive nor ``-1``.
         """
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs < 1:
+            raise ValueError("n_jobs must be positive or -1")
+
+        if n_jobs > 1 and not self._is_picklable():
+            warnings.warn(
+                "agents or bandit cannot be pickled, running trials sequentially",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            n_jobs = 1
+
         sim_stats = SimulationStats(simulation=self)
-        for agent in self.agents:
-            agent_stats = self._run_trials_for_agent(agent, trials, steps, metrics)
-            sim_stats.add(agent_stats)
+        if n_jobs == 1:
+            for agent in self.agents:
+                agent_stats = self._run_trials_for_agent(agent, trials, steps, metrics)
+                sim_stats.add(agent_stats)
+        else:
+            metrics = None if metrics is None else list(metrics)
+            for agent_stats in self._run_trials_in_parallel(
+                trials, steps, metrics, n_jobs
+            ):
+                sim_stats.add(agent_stats)
         return sim_stats
 
+    def _is_picklable(self) -> bool:
+        try:
+            pickle.dumps((self.agents, self.bandit))
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False
+        return True
+
+    def _run_trials_in_parallel(
+        self,
+        trials: int,
+        steps: int,
+        metrics: list[Metric] | None,
+        n_jobs: int,
+    ) -> list[AgentStats]:
+        batches = [len(b) for b in np.array_split(range(trials), n_jobs) if len(b)]
+        rngs = iter(spawn_rngs(self._rng, len(list(self.agents)) * len(batches)))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                [
+                    executor.submit(
+                        _run_trials_in_worker,
+                        agent,
+                        self.bandit,
+                        batch,
+                        steps,
+                        metrics,
+                        next(rngs),
+                    )
+                    for batch in batches
+                ]
+                for agent in self.agents
+            ]
+            all_agent_stats = []
+            for agent, agent_futures in zip(self.agents, futures):
+                agent_stats = AgentStats(agent, self.bandit, steps, metrics)
+                for future in agent_futures:
+                    worker_agent, worker_stats = future.result()
+                    agent_stats.merge(worker_stats)
+                    # leave the agent as a serial run would, after its last trial
+                    agent.load_state(worker_agent)
+                all_agent_stats.append(agent_stats)
+        return all_agent_stats
+
     def _run_trials_for_agent(
         self,
         agent: Agent,
@@ -111,9 +197,38 @@ class Simulation:
         agent_stats = AgentStats(agent, self.bandit, steps, metrics)
         for _ in range(trials):
             agent.prime(len(self.bandit), steps, self._rng)
-            for step in range(steps):
-                choice = agent.choose()
-                reward = self.bandit.play(choice)
-                agent.update(reward)
-                agent_stats.update(step, choice, reward)
+            trial = _kernels.run_trial(agent.strategy, self.bandit, steps, self._rng)
+            if trial is None:
+                trial = self._run_trial(agent, steps)
+            agent_stats.update_trial(*trial)
         return agent_stats
+
+    def _run_trial(
+        self, agent: Agent, steps: int
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        choices = np.empty(steps, dtype=np.int64)
+        rewards = np.empty(steps, dtype=np.float64)
+        variates = self.bandit.sample(steps)
+        for step in range(steps):
+            choice = agent.choose()
+            if variates is None:
+                reward = self.bandit.play(choice)
+            else:
+                reward = self.bandit.play_sampled(choice, variates[step])
+            agent.update(reward)
+            choices[step], rewards[step] = choice, reward
+        return choices, rewards
+
+
+def _run_trials_in_worker(
+    agent: Agent,
+    bandit: Bandit,
+    trials: int,
+    steps: int,
+    metrics: list[Metric] | None,
+    rng: Generator,
+) -> tuple[Agent, AgentStats]:
+    simulation = Simulation(
+        bandit=Bandit(list(bandit), rng=rng), agents=[agent], rng=rng
+    )
+    return agent, simulation._run_trials_for_agent(agent, trials, steps, metrics)
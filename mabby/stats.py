@@ -5,12 +5,13 @@ from __future__ import annotations
 from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Callable
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable
 
 import numpy as np
-from matplotlib import pyplot as plt
 from numpy.typing import NDArray
 
+from mabby import _kernels
 from mabby.exceptions import StatsUsageError
 
 if TYPE_CHECKING:
@@ -27,8 +28,8 @@ class MetricMapping:
     #: The base metric to transform from
     base: Metric
 
-    #: The transformation function
-    transform: Callable[[NDArray[np.float64]], NDArray[np.float64]]
+    #: The transformation function, which may accept an ``out`` keyword argument
+    transform: Callable[..., NDArray[np.float64]]
 
 
 class Metric(Enum):
@@ -91,33 +92,50 @@ class Metric(Enum):
         return self
 
     @classmethod
-    def map_to_base(cls, metrics: Iterable[Metric]) -> Iterable[Metric]:
+    def map_to_base(cls, metrics: Iterable[Metric]) -> frozenset[Metric]:
         """Traces all metrics back to their base metrics.
 
+        Results are cached, so the same collection of metrics maps to the same
+        immutable set.
+
         Args:
             metrics: A collection of metrics.
 
         Returns:
-            A set containing the base metrics of all the input metrics.
+            A frozen set containing the base metrics of all the input metrics.
         """
-        return set(m.base for m in metrics)
+        return _map_to_base(frozenset(metrics))
 
-    def transform(self, values: NDArray[np.float64]) -> NDArray[np.float64]:
+    def transform(
+        self, values: NDArray[np.float64], out: NDArray[np.float64] | None = None
+    ) -> NDArray[np.float64]:
         """Transforms values from the base metric.
 
         If the metric is already a base metric, the input values are returned.
 
         Args:
             values: An array of input values for the base metric.
+            out: An array to store the transformed values in, which may be ``values``
+                itself. If not specified, a new array is allocated.
 
         Returns:
             An array of transformed values for the metric.
         """
         if self._mapping is not None:
-            return self._mapping.transform(values)
+            if out is None:
+                return self._mapping.transform(values)
+            return self._mapping.transform(values, out=out)
+        if out is not None and out is not values:
+            out[...] = values
+            return out
         return values
 
 
+@cache
+def _map_to_base(metrics: frozenset[Metric]) -> frozenset[Metric]:
+    return frozenset(m.base for m in metrics)
+
+
 class SimulationStats:
     """Statistics for a multi-armed bandit simulation."""
 
@@ -129,6 +147,7 @@ class SimulationStats:
         """
         self._simulation: Simulation = simulation
         self._stats_dict: dict[Agent, AgentStats] = {}
+        self._labels: dict[Agent, str] = {}
 
     def add(self, agent_stats: AgentStats) -> None:
         """Adds statistics for an agent.
@@ -137,6 +156,7 @@ class SimulationStats:
             agent_stats: The agent statistics to add.
         """
         self._stats_dict[agent_stats.agent] = agent_stats
+        self._labels[agent_stats.agent] = str(agent_stats.agent)
 
     def __getitem__(self, agent: Agent) -> AgentStats:
         """Gets statistics for an agent.
@@ -159,6 +179,7 @@ class SimulationStats:
         if agent != agent_stats.agent:
             raise StatsUsageError("agents specified in key and value don't match")
         self._stats_dict[agent] = agent_stats
+        self._labels[agent] = str(agent)
 
     def __contains__(self, agent: Agent) -> bool:
         """Returns if an agent's statistics are present.
@@ -174,8 +195,10 @@ class SimulationStats:
         Args:
             metric: The metric to plot.
         """
+        from matplotlib import pyplot as plt
+
         for agent, agent_stats in self._stats_dict.items():
-            plt.plot(agent_stats[metric], label=str(agent))
+            plt.plot(agent_stats[metric], label=self._labels[agent])
         plt.legend()
         plt.show()
 
@@ -223,11 +246,40 @@ class AgentStats:
         """
         self.agent: Agent = agent  #: The agent that statistics are tracked for
         self._bandit = bandit
+        self._means = bandit.means
+        self._best_mean = bandit.max_mean
         self._steps = steps
         self._counts = np.zeros(steps)
 
-        base_metrics = Metric.map_to_base(list(Metric) if metrics is None else metrics)
-        self._stats = {stat: np.zeros(steps) for stat in base_metrics}
+        base_metrics = list(
+            Metric.map_to_base(list(Metric) if metrics is None else metrics)
+        )
+        self._values = np.zeros((len(base_metrics), steps))
+        self._rows = {metric: row for row, metric in enumerate(base_metrics)}
+        self._bind_rows()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Returns the state to pickle, without views into the metric values."""
+        state = vars(self).copy()
+        for name in ("_stats", "_step_rows", "_averages"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores pickled state and rebinds views into the metric values."""
+        vars(self).update(state)
+        self._bind_rows()
+
+    def _bind_rows(self) -> None:
+        self._stats = {metric: self._values[row] for metric, row in self._rows.items()}
+        # averages of all base metrics, computed on access until the next update
+        self._averages: NDArray[np.float64] | None = None
+        # untracked metrics are updated into a scratch row that is never read
+        scratch = np.zeros(self._steps)
+        self._step_rows = tuple(
+            self._stats.get(metric, scratch)
+            for metric in (Metric.REGRET, Metric.REWARDS, Metric.OPTIMALITY)
+        )
 
     def __len__(self) -> int:
         """Returns the number of steps each trial is tracked for."""
@@ -244,9 +296,27 @@ class AgentStats:
         Returns:
             An array of values for the metric.
         """
-        with np.errstate(divide="ignore", invalid="ignore"):
-            values = self._stats[metric.base] / self._counts
-        return metric.transform(values)
+        if self._averages is None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._averages = self._values / self._counts
+        values = self._averages[self._rows[metric.base]]
+        return metric.transform(values, out=np.empty_like(values))
+
+    def merge(self, other: AgentStats) -> None:
+        """Merges in statistics collected from other trials of the agent.
+
+        Args:
+            other: The agent statistics to merge in.
+
+        Raises:
+            StatsUsageError: If the statistics track different steps or metrics.
+        """
+        if other._steps != self._steps or other._stats.keys() != self._stats.keys():
+            raise StatsUsageError("cannot merge stats with different steps or metrics")
+        for metric, values in other._stats.items():
+            self._stats[metric] += values
+        self._counts += other._counts
+        self._averages = None
 
     def update(self, step: int, choice: int, reward: float) -> None:
         """Updates metric values for the latest simulation step.
@@ -256,11 +326,67 @@ class AgentStats:
             choice: The choice made by the agent.
             reward: The reward observed by the agent.
         """
-        regret = self._bandit.regret(choice)
+        self._averages = None
+        regret, rewards, optimality = self._step_rows
+        _kernels.update_step(
+            self._counts,
+            regret,
+            rewards,
+            optimality,
+            self._means,
+            self._best_mean,
+            step,
+            choice,
+            reward,
+        )
+
+    def update_batch(
+        self,
+        steps: NDArray[np.int64],
+        choices: NDArray[np.int64],
+        rewards: NDArray[np.float64],
+    ) -> None:
+        """Updates metric values for a batch of simulation steps.
+
+        This is equivalent to calling
+        [`update`][mabby.stats.AgentStats.update] for each step in the batch, in
+        any order. Steps may repeat within the batch.
+
+        Args:
+            steps: The numbers of the steps.
+            choices: The choices made by the agent at each step.
+            rewards: The rewards observed by the agent at each step.
+        """
+        self._averages = None
+        chosen_means = self._means[choices]
+        weights = {
+            Metric.REGRET: self._best_mean - chosen_means,
+            Metric.REWARDS: rewards,
+            Metric.OPTIMALITY: chosen_means == self._best_mean,
+        }
+        for metric, values in self._stats.items():
+            values += np.bincount(steps, weights=weights[metric], minlength=self._steps)
+        self._counts += np.bincount(steps, minlength=self._steps)
+
+    def update_trial(
+        self, choices: NDArray[np.int64], rewards: NDArray[np.float64]
+    ) -> None:
+        """Updates metric values for every step of a simulation trial.
+
+        This is equivalent to calling
+        [`update`][mabby.stats.AgentStats.update] for each step in order, but
+        computes all updates at once.
+
+        Args:
+            choices: The choices made by the agent at each step.
+            rewards: The rewards observed by the agent at each step.
+        """
+        self._averages = None
+        chosen_means = self._means[choices]
         if Metric.REGRET in self._stats:
-            self._stats[Metric.REGRET][step] += regret
+            self._stats[Metric.REGRET] += self._best_mean - chosen_means
         if Metric.OPTIMALITY in self._stats:
-            self._stats[Metric.OPTIMALITY][step] += int(self._bandit.is_opt(choice))
+            self._stats[Metric.OPTIMALITY] += chosen_means == self._best_mean
         if Metric.REWARDS in self._stats:
-            self._stats[Metric.REWARDS][step] += reward
-        self._counts[step] += 1
+            self._stats[Metric.REWARDS] += rewards
+        self._counts += 1
@@ -15,6 +15,7 @@ from numpy.random import Generator
 from numpy.typing import NDArray
 from overrides import EnforceOverrides, override
 
+from mabby.exceptions import StrategyUsageError
 from mabby.strategies.strategy import Strategy
 from mabby.utils import random_argmax
 
@@ -55,6 +56,13 @@ class SemiUniformStrategy(Strategy, ABC, EnforceOverrides):
         self._Ns[choice] += 1
         self._Qs[choice] += (reward - self._Qs[choice]) / self._Ns[choice]
 
+    @override
+    def load_state(self, other: Strategy) -> None:
+        if not isinstance(other, type(self)):
+            raise StrategyUsageError("cannot load state from a different strategy type")
+        self._Qs = other._Qs.copy()
+        self._Ns = other._Ns.copy()
+
     @property
     @override
     def Qs(self) -> NDArray[np.float64]:
@@ -89,6 +97,11 @@ class RandomStrategy(SemiUniformStrategy):
     def __repr__(self) -> str:
         return "random"
 
+    @override
+    def choose(self, rng: Generator) -> int:
+        # always explores, so no draw is needed to decide
+        return self._explore(rng=rng)
+
     @override
     def effective_eps(self) -> float:
         return 1
@@ -153,6 +166,13 @@ class EpsilonFirstStrategy(SemiUniformStrategy):
     def effective_eps(self) -> float:
         return float(self._explore_steps_remaining > 0)
 
+    @override
+    def load_state(self, other: Strategy) -> None:
+        if not isinstance(other, type(self)):
+            raise StrategyUsageError("cannot load state from a different strategy type")
+        super().load_state(other)
+        self._explore_steps_remaining = other._explore_steps_remaining
+
     @override
     def update(self, choice: int, reward: float, rng: Generator | None = None) -> None:
         super().update(choice, reward, rng=rng)
@@ -67,6 +67,21 @@ class Strategy(ABC, EnforceOverrides):
     def Ns(self) -> NDArray[np.uint32]:
         """The number of times each arm has been played."""
 
+    def load_state(self, other: Strategy) -> None:
+        """Loads the parameter estimates of another strategy of the same type.
+
+        This brings the strategy up to date with a copy of it that was run elsewhere,
+        e.g. in another process, as if the copy's trials had been run on the strategy
+        itself. Strategies that support this must override the method.
+
+        Args:
+            other: A primed strategy of the same type to load the state of.
+
+        Raises:
+            NotImplementedError: If the strategy does not support loading state.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot load state")
+
     def agent(self, **kwargs: str) -> Agent:
         """Creates an agent following the strategy.
 
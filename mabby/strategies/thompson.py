@@ -9,14 +9,13 @@ from overrides import override
 
 from mabby.exceptions import StrategyUsageError
 from mabby.strategies.strategy import Strategy
-from mabby.utils import random_argmax
 
 
 class BetaTSStrategy(Strategy):
     """Thompson sampling strategy with Beta priors."""
 
-    _a: NDArray[np.uint32]
-    _b: NDArray[np.uint32]
+    _a: NDArray[np.float64]
+    _b: NDArray[np.float64]
 
     def __init__(self, general: bool = False):
         """Initializes a Beta Thompson sampling strategy.
@@ -35,13 +34,14 @@ class BetaTSStrategy(Strategy):
 
     @override
     def prime(self, k: int, steps: int) -> None:
-        self._a = np.ones(k, dtype=np.uint32)
-        self._b = np.ones(k, dtype=np.uint32)
+        self._a = np.ones(k, dtype=np.float64)
+        self._b = np.ones(k, dtype=np.float64)
 
     @override
     def choose(self, rng: Generator) -> int:
         samples = rng.beta(a=self._a, b=self._b)
-        return random_argmax(samples, rng=rng)
+        # ties between continuous samples have probability zero
+        return int(np.argmax(samples))
 
     @override
     def update(self, choice: int, reward: float, rng: Generator | None = None) -> None:
@@ -59,6 +59,13 @@ class BetaTSStrategy(Strategy):
         self._a[choice] += pseudo_reward
         self._b[choice] += 1 - pseudo_reward
 
+    @override
+    def load_state(self, other: Strategy) -> None:
+        if not isinstance(other, type(self)):
+            raise StrategyUsageError("cannot load state from a different strategy type")
+        self._a = other._a.copy()
+        self._b = other._b.copy()
+
     @property
     @override
     def Qs(self) -> NDArray[np.float64]:
@@ -67,4 +74,4 @@ class BetaTSStrategy(Strategy):
     @property
     @override
     def Ns(self) -> NDArray[np.uint32]:
-        return ((self._a + self._b).astype(np.int64) - 2).astype(np.uint32)
+        return (self._a + self._b - 2).astype(np.uint32)
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import math
+
 import numpy as np
 from numpy.random import Generator
 from numpy.typing import NDArray
 from overrides import override
 
+from mabby.exceptions import StrategyUsageError
 from mabby.strategies.strategy import Strategy
 from mabby.utils import random_argmax
 
@@ -45,7 +48,7 @@ class UCB1Strategy(Strategy):
         return random_argmax(self._compute_UCBs(), rng=rng)
 
     def _compute_UCBs(self) -> NDArray[np.float64]:
-        return self._Qs + self.alpha * np.sqrt(np.log(self._t) / self._Ns)
+        return self._Qs + self.alpha * np.sqrt(np.divide(math.log(self._t), self._Ns))
 
     @override
     def update(self, choice: int, reward: float, rng: Generator | None = None) -> None:
@@ -53,6 +56,14 @@ class UCB1Strategy(Strategy):
         self._Ns[choice] += 1
         self._Qs[choice] += (reward - self._Qs[choice]) / self._Ns[choice]
 
+    @override
+    def load_state(self, other: Strategy) -> None:
+        if not isinstance(other, type(self)):
+            raise StrategyUsageError("cannot load state from a different strategy type")
+        self._t = other._t
+        self._Qs = other._Qs.copy()
+        self._Ns = other._Ns.copy()
+
     @property
     @override
     def Qs(self) -> NDArray[np.float64]:
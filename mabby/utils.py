@@ -10,7 +10,8 @@ from numpy.typing import ArrayLike
 def random_argmax(values: ArrayLike, rng: Generator) -> int:
     """Computes random argmax of an array.
 
-    If there are multiple maximums, the index of one is chosen at random.
+    If there are multiple maximums, the index of one is chosen at random. Otherwise,
+    the index of the maximum is returned without drawing from ``rng``.
 
     Args:
         values: An input array.
@@ -19,5 +20,24 @@ def random_argmax(values: ArrayLike, rng: Generator) -> int:
     Returns:
         The random argmax of the input array.
     """
-    candidates = np.where(values == np.max(values))[0]
+    candidates = np.flatnonzero(values == np.max(values))
+    if len(candidates) == 1:
+        return int(candidates[0])
     return int(rng.choice(candidates))
+
+
+def spawn_rngs(rng: Generator, n: int) -> list[Generator]:
+    """Spawns independent child random number generators.
+
+    The children are seeded from a single draw of the parent, so spawning from a
+    seeded generator is reproducible, and each child produces an independent stream.
+
+    Args:
+        rng: The parent random number generator.
+        n: The number of child generators to spawn.
+
+    Returns:
+        A list of ``n`` child random number generators.
+    """
+    seed_seq = np.random.SeedSequence(rng.integers(2**63, size=4))
+    return [np.random.default_rng(child) for child in seed_seq.spawn(n)]
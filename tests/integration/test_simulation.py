@@ -38,7 +38,7 @@ def test_epsilon_greedy_bernoulli_bandits_simulation(p, eps):
     bandit = BernoulliArm.bandit(p=p, rng=rng)
     agents = [EpsilonGreedyStrategy(eps=e).agent() for e in eps]
     sim = Simulation(agents=agents, bandit=bandit, rng=rng)
-    sim.run(trials=1, steps=10000)
+    sim.run(trials=1, steps=100000)
     opt_arm = np.argmax(p)
     for agent in agents:
         assert np.allclose(agent.Qs, p, rtol=0.1)
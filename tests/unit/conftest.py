@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import random
+from contextlib import contextmanager
 
 import numpy as np
 import pytest
@@ -11,9 +11,14 @@ from overrides import override
 from mabby import Agent, Arm
 from mabby.strategies import Strategy
 
+_GENERATOR_SPEC = dir(Generator)
+_FIXTURE_SEED = 20230415
+
 
 class GenericStrategy(Strategy):
     k: int
+    _Qs: NDArray[np.float64]
+    _Ns: NDArray[np.int32]
 
     def __init__(self) -> None:
         pass
@@ -25,6 +30,8 @@ class GenericStrategy(Strategy):
     @override
     def prime(self, k: int, steps: int) -> None:
         self.k = k
+        self._Qs = np.zeros(k)
+        self._Ns = np.zeros(k, dtype=np.int32)
 
     @override
     def choose(self, rng: Generator) -> int:
@@ -34,15 +41,20 @@ class GenericStrategy(Strategy):
     def update(self, choice: int, reward: float, rng: Generator | None = None) -> None:
         pass
 
+    @override
+    def load_state(self, other: Strategy) -> None:
+        if isinstance(other, GenericStrategy):
+            self.k, self._Qs, self._Ns = other.k, other._Qs.copy(), other._Ns.copy()
+
     @property
     @override
     def Qs(self) -> NDArray[np.float64]:
-        return np.zeros(self.k)
+        return self._Qs
 
     @property
     @override
     def Ns(self) -> NDArray[np.int32]:
-        return np.zeros(self.k)
+        return self._Ns
 
 
 class GenericArm(Arm):
@@ -63,7 +75,56 @@ class GenericArm(Arm):
         return "generic-arm"
 
 
+_LIFECYCLE_PREFIXES = ("test_prime", "test_choose", "test_update", "test__run_trial")
+
+
+def pytest_collection_modifyitems(items):
+    for item in items:
+        name = item.originalname
+        if name.startswith("test_init"):
+            item.add_marker(pytest.mark.strategy_init)
+        if name.startswith(_LIFECYCLE_PREFIXES):
+            item.add_marker(pytest.mark.lifecycle)
+        if "raises_error" in name or "raise_error" in name:
+            item.add_marker(pytest.mark.error_paths)
+
+
+@pytest.fixture(scope="session")
+def unabstract():
+    @contextmanager
+    def unabstract(cls):
+        abstract_methods = cls.__abstractmethods__
+        cls.__abstractmethods__ = frozenset()
+        try:
+            yield
+        finally:
+            cls.__abstractmethods__ = abstract_methods
+
+    return unabstract
+
+
+@pytest.fixture
+def count_calls(mocker):
+    def count_calls(obj, name):
+        func = getattr(obj, name)
+
+        def counted(*args, **kwargs):
+            counted.call_count += 1
+            return func(*args, **kwargs)
+
+        counted.call_count = 0
+        mocker.patch.object(obj, name, counted)
+        return counted
+
+    return count_calls
+
+
 @pytest.fixture
+def mock_rng(mocker):
+    return mocker.Mock(spec=_GENERATOR_SPEC)
+
+
+@pytest.fixture(scope="session")
 def strategy_factory():
     class GenericStrategyFactory:
         @staticmethod
@@ -73,7 +134,7 @@ def strategy_factory():
     return GenericStrategyFactory
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def agent_factory(strategy_factory):
     class GenericAgentFactory:
         @staticmethod
@@ -85,12 +146,17 @@ def agent_factory(strategy_factory):
 
 
 @pytest.fixture
-def arm_factory():
+def fixture_rng():
+    return np.random.default_rng(_FIXTURE_SEED)
+
+
+@pytest.fixture
+def arm_factory(fixture_rng):
     class GenericArmFactory:
         @staticmethod
         def generic(mean: float | None = None):
             if mean is None:
-                mean = random.random()
+                mean = float(fixture_rng.random())
             return GenericArm(mean=mean)
 
     return GenericArmFactory
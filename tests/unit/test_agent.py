@@ -1,7 +1,6 @@
 from unittest.mock import patch
 
 import pytest
-from numpy.random import Generator
 
 from mabby import Agent
 from mabby.exceptions import AgentUsageError
@@ -12,8 +11,9 @@ class TestAgent:
 
     @pytest.fixture(params=[{}, {"name": "agent-name"}])
     def valid_params(self, request, strategy_factory):
-        request.param["strategy"] = strategy_factory.generic()
-        return request.param
+        params = dict(request.param)
+        params["strategy"] = strategy_factory.generic()
+        return params
 
     @pytest.fixture(params=[{"k": 3, "steps": 20}])
     def prime_params(self, request):
@@ -29,11 +29,11 @@ class TestAgent:
 
     @pytest.fixture
     def mock_rng(self, mocker):
-        return mocker.Mock(spec=Generator)
+        return mocker.sentinel.rng
 
     @pytest.fixture
-    def agent(self, valid_params):
-        return self.AGENT_CLASS(**valid_params)
+    def agent(self, strategy_factory):
+        return self.AGENT_CLASS(strategy=strategy_factory.generic())
 
     @pytest.fixture
     def primed_agent(self, prime_params, mock_rng, agent):
@@ -45,19 +45,16 @@ class TestAgent:
         primed_agent._choice = choice
         return primed_agent
 
-    def test_init_sets_name(self, valid_params, agent):
-        assert agent._name == valid_params.get("name")
-
-    @pytest.mark.parametrize("name", ["agent-name"])
-    def test_repr_returns_custom_name_if_overridden(self, valid_params, name):
-        valid_params["name"] = name
+    def test_init_sets_name(self, valid_params):
         agent = self.AGENT_CLASS(**valid_params)
-        assert repr(agent) == name
+        assert agent._name == valid_params.get("name")
 
-    def test_repr_returns_strategy_name_if_not_overridden(self, valid_params):
-        valid_params["name"] = None
-        agent = self.AGENT_CLASS(**valid_params)
-        assert repr(agent) == str(agent.strategy)
+    @pytest.mark.parametrize(
+        "name", ["agent-name", None], ids=["overridden", "not-overridden"]
+    )
+    def test_repr_returns_custom_name_or_strategy_name(self, strategy_factory, name):
+        agent = self.AGENT_CLASS(strategy=strategy_factory.generic(), name=name)
+        assert repr(agent) == (name if name is not None else str(agent.strategy))
 
     def test_prime_invokes_strategy_prime(self, mocker, mock_rng, agent, prime_params):
         strategy_prime = mocker.spy(agent.strategy, "prime")
@@ -67,8 +64,9 @@ class TestAgent:
     def test_choose_invokes_strategy_choose(
         self, mocker, mock_rng, primed_agent, choice
     ):
-        mocker.patch.object(primed_agent.strategy, "choose", return_value=choice)
-        strategy_choose = mocker.spy(primed_agent.strategy, "choose")
+        strategy_choose = mocker.patch.object(
+            primed_agent.strategy, "choose", return_value=choice
+        )
         primed_agent.choose()
         strategy_choose.assert_called_once_with(mock_rng)
 
@@ -89,24 +87,45 @@ class TestAgent:
         chosen_agent.update(reward)
         assert chosen_agent._choice is None
 
-    def test_Qs_returns_strategy_Qs(self, primed_agent):
-        assert (primed_agent.Qs == primed_agent.strategy.Qs).all()
-
-    def test_Ns_returns_strategy_Ns(self, primed_agent):
-        assert (primed_agent.Ns == primed_agent.strategy.Ns).all()
+    @pytest.mark.parametrize("attr", ["Qs", "Ns"])
+    def test_estimates_return_strategy_estimates(self, primed_agent, attr):
+        estimates = getattr(primed_agent, attr)
+        assert (estimates == getattr(primed_agent.strategy, attr)).all()
 
     def test_choose_before_prime_raises_error(self, agent):
         with pytest.raises(AgentUsageError):
             agent.choose()
 
-    def test_Qs_before_prime_raises_error(self, agent):
-        with pytest.raises(AgentUsageError):
-            assert agent.Qs is not None
-
-    def test_Ns_before_prime_raises_error(self, agent):
+    @pytest.mark.parametrize("attr", ["Qs", "Ns"])
+    def test_estimates_before_prime_raise_error(self, agent, attr):
         with pytest.raises(AgentUsageError):
-            assert agent.Ns is not None
+            assert getattr(agent, attr) is not None
 
     def test_update_before_choose_raises_error(self, primed_agent, reward):
         with pytest.raises(AgentUsageError):
             primed_agent.update(reward=reward)
+
+    def test_load_state_loads_strategy_state_in_place(
+        self, mocker, agent, strategy_factory, prime_params
+    ):
+        strategy = agent.strategy
+        other = self.AGENT_CLASS(strategy=strategy_factory.generic())
+        other.prime(**prime_params, rng=mocker.sentinel.other_rng)
+        load_state = mocker.spy(strategy, "load_state")
+        agent.load_state(other)
+        load_state.assert_called_once_with(other.strategy)
+        assert agent.strategy is strategy
+        assert agent._primed and agent._rng is mocker.sentinel.other_rng
+        assert len(agent.Qs) == len(agent.Ns) == prime_params["k"]
+
+    def test_load_state_replaces_strategy_that_cannot_load_state(
+        self, mocker, agent, strategy_factory, prime_params
+    ):
+        mocker.patch.object(
+            agent.strategy, "load_state", side_effect=NotImplementedError
+        )
+        other = self.AGENT_CLASS(strategy=strategy_factory.generic())
+        other.prime(**prime_params, rng=mocker.sentinel.other_rng)
+        agent.load_state(other)
+        assert agent.strategy is other.strategy
+        assert agent._primed
@@ -1,5 +1,3 @@
-import random
-
 import numpy as np
 import pytest
 
@@ -7,18 +5,28 @@ from mabby import Arm, Bandit
 from mabby.arms import BernoulliArm, GaussianArm
 
 
+class StubRng:
+    def __init__(self, rng):
+        self._rng = rng
+
+    def integers(self, n):
+        return int(self._rng.integers(n))
+
+
 @pytest.fixture()
-def mock_rng(mocker):
-    return mocker.Mock(choice=lambda xs: random.choice(xs))
+def mock_rng(fixture_rng):
+    return StubRng(fixture_rng)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patch_abstract_methods(unabstract):
+    with unabstract(Arm):
+        yield
 
 
 class TestArm:
     ARM_CLASS = Arm
 
-    @pytest.fixture(autouse=True)
-    def patch_abstract_methods(self, mocker):
-        mocker.patch.object(Arm, "__abstractmethods__", new_callable=set)
-
     @pytest.fixture
     def valid_params(self):
         pass
@@ -43,15 +51,23 @@ class TestArm:
     def bandit(self, bandit_params):
         return self.ARM_CLASS.bandit(**bandit_params)
 
-    @pytest.fixture(params=[100000])
+    @pytest.fixture(params=[1000000])
     def sample(self, request, arm):
         rng = np.random.default_rng(seed=0)
-        return [arm.play(rng) for _ in range(request.param)]
+        return arm.play_batch(rng, request.param)
 
     def test_init_with_invalid_params_raises_error(self, arm, invalid_params):
         with pytest.raises(ValueError):
             self.ARM_CLASS(**invalid_params)
 
+    @pytest.mark.parametrize("n", [3])
+    def test_play_batch_plays_arm_n_times_by_default(self, mocker, arm_factory, n):
+        arm = arm_factory.generic()
+        play_spy = mocker.spy(arm, "play")
+        rewards = arm.play_batch(np.random.default_rng(seed=0), n)
+        assert play_spy.call_count == n
+        np.testing.assert_array_equal(rewards, [play_spy.spy_return] * n)
+
     def test_bandit_returns_bandit_with_correct_types(self, bandit):
         assert isinstance(bandit, Bandit)
         for arm in bandit:
@@ -88,6 +104,26 @@ class TestBernoulliArm(TestArm):
         assert np.logical_or(np.equal(sample, 0), np.equal(sample, 1)).any()
         assert np.isclose(np.mean(sample), valid_params["p"], rtol=0.01)
 
+    def test_bandit_packs_p_into_array(self, bandit_params, bandit):
+        np.testing.assert_array_equal(bandit._params["p"], bandit_params["p"])
+
+    def test_bandit_play_generates_bernoulli_rewards(self, bandit):
+        for i in range(len(bandit)):
+            assert bandit.play(i) in (0, 1)
+
+    @pytest.mark.parametrize("steps", [5])
+    def test_bandit_sample_generates_uniform_variates(self, bandit, steps):
+        variates = bandit.sample(steps)
+        assert variates.shape == (steps,)
+        assert ((variates >= 0) & (variates < 1)).all()
+
+    @pytest.mark.parametrize("variate", [0.0, 0.15, 0.5, 0.99])
+    def test_bandit_play_sampled_thresholds_variate_by_p(
+        self, bandit_params, bandit, variate
+    ):
+        for i, p in enumerate(bandit_params["p"]):
+            assert bandit.play_sampled(i, variate) == float(variate < p)
+
     def test_mean_equals_to_p(self, arm, valid_params):
         assert arm.mean == valid_params["p"]
 
@@ -118,6 +154,22 @@ class TestGaussianArm(TestArm):
         assert np.isclose(np.mean(sample), valid_params["loc"], rtol=0.05)
         assert np.isclose(np.std(sample), valid_params["scale"], rtol=0.05)
 
+    def test_bandit_packs_loc_and_scale_into_arrays(self, bandit):
+        np.testing.assert_array_equal(bandit._params["loc"], [a.loc for a in bandit])
+        np.testing.assert_array_equal(
+            bandit._params["scale"], [a.scale for a in bandit]
+        )
+
+    @pytest.mark.parametrize("steps", [5])
+    def test_bandit_sample_generates_a_variate_for_each_step(self, bandit, steps):
+        variates = bandit.sample(steps)
+        assert variates.shape == (steps,)
+
+    @pytest.mark.parametrize("variate", [-1.5, 0.0, 2.0])
+    def test_bandit_play_sampled_scales_and_shifts_variate(self, bandit, variate):
+        for i, arm in enumerate(bandit):
+            assert bandit.play_sampled(i, variate) == arm.loc + arm.scale * variate
+
     def test_mean_equals_to_loc(self, arm, valid_params):
         assert arm.mean == valid_params["loc"]
 
@@ -159,13 +211,15 @@ class TestBandit:
             assert arm == arms[i]
 
     @pytest.mark.parametrize("choice", [0, 1])
-    def test_play_invokes_play_of_correct_arm(
-        self, mocker, arms, bandit, mock_rng, choice
-    ):
+    def test_play_invokes_play_of_correct_arm(self, mocker, arms, mock_rng, choice):
         play_spy = mocker.spy(arms[choice], "play")
+        bandit = Bandit(arms=arms, rng=mock_rng)
         bandit.play(choice)
         play_spy.assert_called_once_with(mock_rng)
 
+    def test_sample_returns_none_for_other_arms(self, bandit):
+        assert bandit.sample(steps=5) is None
+
     def test_best_arm_returns_arm_with_max_mean(self, arms, bandit):
         best_arm = bandit.best_arm()
         assert arms[best_arm].mean == max(arm.mean for arm in arms)
@@ -178,6 +232,21 @@ class TestBandit:
         assert len(values) == num_arms
         assert np.allclose(counts, np.mean(counts), rtol=0.1)
 
+    def test_best_arm_with_single_optimal_arm_skips_rng(
+        self, mocker, arm_factory, num_arms
+    ):
+        arms = [arm_factory.generic(mean=i) for i in range(num_arms)]
+        rng = mocker.Mock()
+        bandit = Bandit(arms=arms, rng=rng)
+        assert bandit.best_arm() == num_arms - 1
+        rng.integers.assert_not_called()
+
+    def test_means_returns_read_only_array_of_arm_means(self, arms, bandit):
+        np.testing.assert_array_equal(bandit.means, [arm.mean for arm in arms])
+        assert bandit.means is bandit.means
+        with pytest.raises(ValueError):
+            bandit.means[0] = 0
+
     def test_is_opt_returns_true_for_optimal_choice(self, arms, bandit):
         opt_choice = int(np.argmax(bandit.means))
         assert bandit.is_opt(opt_choice)
@@ -189,4 +258,7 @@ class TestBandit:
     @pytest.mark.parametrize("choice", [0, 1])
     def test_regret_returns_difference_in_mean(self, arms, bandit, choice):
         regret = bandit.regret(choice)
-        assert regret == max(arm.mean for arm in arms) - arms[choice].mean
+        assert regret == bandit.max_mean - arms[choice].mean
+
+    def test_max_mean_returns_greatest_arm_mean(self, arms, bandit):
+        assert bandit.max_mean == max(arm.mean for arm in arms)
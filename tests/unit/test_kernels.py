@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+from mabby import Agent, Bandit, BernoulliArm, GaussianArm, Simulation
+from mabby._kernels import run_trial, update_step
+from mabby.strategies import (
+    BetaTSStrategy,
+    EpsilonFirstStrategy,
+    EpsilonGreedyStrategy,
+    RandomStrategy,
+    UCB1Strategy,
+)
+
+pytest.importorskip("numba")
+
+
+@pytest.fixture
+def bernoulli_bandit():
+    return BernoulliArm.bandit(p=[0.2, 0.5, 0.7], seed=12)
+
+
+@pytest.fixture
+def gaussian_bandit():
+    return GaussianArm.bandit(loc=[0.2, 0.5, 0.7], scale=[1, 1, 1], seed=12)
+
+
+@pytest.fixture(params=[20])
+def steps(request):
+    return request.param
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(2491)
+
+
+def primed(strategy, bandit, steps):
+    strategy.prime(len(bandit), steps)
+    return strategy
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [RandomStrategy(), EpsilonGreedyStrategy(eps=0.2), UCB1Strategy(alpha=0.5)],
+    ids=["random", "eps-greedy", "ucb1"],
+)
+@pytest.mark.parametrize("bandit_name", ["bernoulli_bandit", "gaussian_bandit"])
+def test_run_trial_updates_Qs_and_Ns(request, strategy, bandit_name, steps, rng):
+    bandit = request.getfixturevalue(bandit_name)
+    strategy = primed(strategy, bandit, steps)
+    choices, rewards = run_trial(strategy, bandit, steps, rng)
+    assert len(choices) == len(rewards) == steps
+    assert ((choices >= 0) & (choices < len(bandit))).all()
+    np.testing.assert_array_equal(
+        strategy.Ns, np.bincount(choices, minlength=len(bandit))
+    )
+    for i in range(len(bandit)):
+        if strategy.Ns[i] > 0:
+            assert np.isclose(strategy.Qs[i], rewards[choices == i].mean())
+
+
+def test_run_trial_advances_ucb1_t(bernoulli_bandit, steps, rng):
+    strategy = primed(UCB1Strategy(alpha=0.5), bernoulli_bandit, steps)
+    choices, _ = run_trial(strategy, bernoulli_bandit, steps, rng)
+    assert strategy._t == steps
+    np.testing.assert_array_equal(
+        choices[: len(bernoulli_bandit)], np.arange(len(bernoulli_bandit))
+    )
+
+
+@pytest.mark.parametrize("general", [True, False])
+def test_run_trial_updates_beta_ts_a_and_b(bernoulli_bandit, steps, rng, general):
+    strategy = primed(BetaTSStrategy(general=general), bernoulli_bandit, steps)
+    choices, rewards = run_trial(strategy, bernoulli_bandit, steps, rng)
+    assert np.logical_or(rewards == 0, rewards == 1).all()
+    assert strategy.Ns.sum() == steps
+    assert strategy._a.sum() - len(bernoulli_bandit) == rewards.sum()
+
+
+def test_run_trial_returns_none_for_beta_ts_on_gaussian_bandit(
+    gaussian_bandit, steps, rng
+):
+    strategy = primed(BetaTSStrategy(), gaussian_bandit, steps)
+    assert run_trial(strategy, gaussian_bandit, steps, rng) is None
+
+
+def test_run_trial_returns_none_for_other_strategies(bernoulli_bandit, steps, rng):
+    strategy = primed(EpsilonFirstStrategy(eps=0.2), bernoulli_bandit, steps)
+    assert run_trial(strategy, bernoulli_bandit, steps, rng) is None
+
+
+def test_run_trial_returns_none_for_other_arms(arm_factory, steps, rng):
+    bandit = Bandit([arm_factory.generic() for _ in range(3)])
+    strategy = primed(EpsilonGreedyStrategy(eps=0.2), bandit, steps)
+    assert run_trial(strategy, bandit, steps, rng) is None
+
+
+def bernoulli_bandit_factory():
+    return BernoulliArm.bandit(p=[0.2, 0.5, 0.7], seed=12)
+
+
+def gaussian_bandit_factory():
+    return GaussianArm.bandit(loc=[0.2, 0.5, 0.7], scale=[1, 1, 1], seed=12)
+
+
+@pytest.mark.parametrize(
+    ("strategy_factory", "bandit_factory"),
+    [
+        (RandomStrategy, bernoulli_bandit_factory),
+        (RandomStrategy, gaussian_bandit_factory),
+        (lambda: EpsilonGreedyStrategy(eps=0.2), bernoulli_bandit_factory),
+        (lambda: EpsilonGreedyStrategy(eps=0.2), gaussian_bandit_factory),
+        (lambda: EpsilonGreedyStrategy(eps=1.0), bernoulli_bandit_factory),
+        (lambda: UCB1Strategy(alpha=0.5), bernoulli_bandit_factory),
+        (lambda: UCB1Strategy(alpha=0.5), gaussian_bandit_factory),
+        (BetaTSStrategy, bernoulli_bandit_factory),
+        (lambda: BetaTSStrategy(general=True), bernoulli_bandit_factory),
+    ],
+    ids=[
+        "random-bernoulli",
+        "random-gaussian",
+        "eps-greedy-bernoulli",
+        "eps-greedy-gaussian",
+        "eps-greedy-always-explore-bernoulli",
+        "ucb1-bernoulli",
+        "ucb1-gaussian",
+        "beta-ts-bernoulli",
+        "general-beta-ts-bernoulli",
+    ],
+)
+@pytest.mark.parametrize("steps", [200])
+def test_run_trial_matches_simulation_loop(strategy_factory, bandit_factory, steps):
+    bandit, loop_bandit = bandit_factory(), bandit_factory()
+    rng, loop_rng = (np.random.default_rng(2491) for _ in range(2))
+    strategy = primed(strategy_factory(), bandit, steps)
+    agent = Agent(strategy=strategy_factory())
+    agent.prime(len(loop_bandit), steps, loop_rng)
+    simulation = Simulation(bandit=loop_bandit, agents=[agent], rng=loop_rng)
+    choices, rewards = run_trial(strategy, bandit, steps, rng)
+    loop_choices, loop_rewards = simulation._run_trial(agent, steps)
+    np.testing.assert_array_equal(choices, loop_choices)
+    np.testing.assert_array_equal(rewards, loop_rewards)
+
+
+@pytest.mark.parametrize("choice", [0, 2])
+def test_update_step_updates_stats_for_step(steps, choice):
+    counts, regret, rewards, optimality = np.zeros((4, steps))
+    means = np.array([0.2, 0.5, 0.7])
+    update_step(counts, regret, rewards, optimality, means, 0.7, 3, choice, 1.0)
+    assert counts[3] == 1 and counts.sum() == 1
+    assert regret[3] == 0.7 - means[choice]
+    assert rewards[3] == 1.0
+    assert optimality[3] == (choice == 2)
@@ -1,11 +1,13 @@
-import random
-
+import numpy as np
 import pytest
 from numpy.random import Generator
 
-from mabby import Bandit, Simulation
+from mabby import Agent, Bandit, BernoulliArm, Simulation
 from mabby.exceptions import SimulationUsageError
+from mabby.simulation import _run_trials_in_worker
 from mabby.stats import AgentStats, SimulationStats
+from mabby.strategies import UCB1Strategy
+from mabby.utils import spawn_rngs
 
 
 @pytest.fixture(params=[2])
@@ -23,9 +25,9 @@ def agents(num_agents, agent_factory):
     return [agent_factory.generic() for _ in range(num_agents)]
 
 
-@pytest.fixture
-def agent(agents):
-    return random.choice(agents)
+@pytest.fixture(params=[0])
+def agent(request, agents):
+    return agents[request.param]
 
 
 @pytest.fixture
@@ -85,19 +87,80 @@ class TestSimulation:
             assert i >= len(names) or agent._name == names[i]
 
     def test_run_returns_sim_stats_with_agent_stats(
-        self, mocker, agents, bandit, simulation, run_params
+        self, mocker, count_calls, agents, bandit, simulation, run_params
     ):
         mocker.patch.object(
             simulation,
             "_run_trials_for_agent",
             lambda b, _, steps, metrics: AgentStats(b, bandit, steps, metrics),
         )
-        run_trials_for_agent_spy = mocker.spy(simulation, "_run_trials_for_agent")
+        run_trials_for_agent = count_calls(simulation, "_run_trials_for_agent")
         sim_stats = simulation.run(**run_params)
         assert isinstance(sim_stats, SimulationStats)
         for agent in agents:
             assert agent in sim_stats
-        assert run_trials_for_agent_spy.call_count == len(agents)
+        assert run_trials_for_agent.call_count == len(agents)
+
+    @pytest.mark.parametrize("n_jobs", [2])
+    def test_run_with_n_jobs_runs_all_trials_for_each_agent(
+        self, agents, simulation, run_params, n_jobs
+    ):
+        sim_stats = simulation.run(**run_params, n_jobs=n_jobs)
+        for agent in agents:
+            assert agent in sim_stats
+            agent_stats = sim_stats[agent]
+            assert agent_stats.agent is agent
+            assert (agent_stats._counts == run_params["trials"]).all()
+
+    @pytest.mark.parametrize("n_jobs", [2])
+    def test_run_with_n_jobs_keeps_and_primes_agent_strategies(
+        self, agents, bandit, simulation, run_params, n_jobs
+    ):
+        strategies = [agent.strategy for agent in agents]
+        simulation.run(**run_params, n_jobs=n_jobs)
+        for agent, strategy in zip(agents, strategies):
+            assert agent.strategy is strategy
+            assert len(strategy.Qs) == len(strategy.Ns) == len(bandit)
+
+    @pytest.mark.parametrize("n_jobs,trials,steps", [(2, 5, 20)])
+    def test_run_with_n_jobs_leaves_state_of_last_worker_trial(
+        self, n_jobs, trials, steps
+    ):
+        bandit = BernoulliArm.bandit(p=[0.2, 0.5, 0.7], seed=31)
+        strategy = UCB1Strategy(alpha=0.5)
+        simulation = Simulation(bandit=bandit, strategies=[strategy], seed=58)
+        simulation.run(trials=trials, steps=steps, n_jobs=n_jobs)
+        batches = np.array_split(range(trials), n_jobs)
+        last_rng = spawn_rngs(np.random.default_rng(58), n_jobs)[-1]
+        expected, _ = _run_trials_in_worker(
+            Agent(strategy=UCB1Strategy(alpha=0.5)),
+            bandit,
+            len(batches[-1]),
+            steps,
+            None,
+            last_rng,
+        )
+        assert simulation.agents[0].strategy is strategy
+        assert strategy._t == expected.strategy._t
+        np.testing.assert_array_equal(strategy.Qs, expected.strategy.Qs)
+        np.testing.assert_array_equal(strategy.Ns, expected.strategy.Ns)
+
+    @pytest.mark.parametrize("n_jobs", [2])
+    def test_run_with_n_jobs_and_unpicklable_agent_runs_sequentially(
+        self, mocker, agents, simulation, run_params, n_jobs
+    ):
+        agents[0].strategy.unpicklable = lambda: None
+        run_trials_in_parallel = mocker.spy(simulation, "_run_trials_in_parallel")
+        with pytest.warns(RuntimeWarning):
+            sim_stats = simulation.run(**run_params, n_jobs=n_jobs)
+        run_trials_in_parallel.assert_not_called()
+        for agent in agents:
+            assert (sim_stats[agent]._counts == run_params["trials"]).all()
+
+    @pytest.mark.parametrize("n_jobs", [0, -2])
+    def test_run_with_invalid_n_jobs_raises_error(self, simulation, run_params, n_jobs):
+        with pytest.raises(ValueError):
+            simulation.run(**run_params, n_jobs=n_jobs)
 
     def test__run_trials_for_agent_returns_agent_stats(
         self, agent, simulation, run_params
@@ -105,23 +168,30 @@ class TestSimulation:
         agent_stats = simulation._run_trials_for_agent(agent, **run_params)
         assert isinstance(agent_stats, AgentStats)
 
-    def test__run_trials_for_agent_primes_agent_each_trial(
-        self, mocker, agent, simulation, run_params
+    def test__run_trials_for_agent_primes_each_trial_and_steps_each_step(
+        self, count_calls, agent, bandit, simulation, run_params
     ):
-        prime_spy = mocker.spy(agent, "prime")
+        prime = count_calls(agent, "prime")
+        choose = count_calls(agent, "choose")
+        play = count_calls(bandit, "play")
+        update = count_calls(agent, "update")
+        update_trial = count_calls(AgentStats, "update_trial")
         simulation._run_trials_for_agent(agent, **run_params)
-        assert prime_spy.call_count == run_params["trials"]
+        assert prime.call_count == run_params["trials"]
+        total_count = run_params["trials"] * run_params["steps"]
+        assert choose.call_count == play.call_count == update.call_count == total_count
+        assert update_trial.call_count * run_params["steps"] == total_count
 
-    def test__run_trials_for_agent_chooses_plays_updates_each_step(
-        self, mocker, agent, bandit, simulation, run_params
+    def test__run_trials_for_agent_uses_sampled_rewards_if_available(
+        self, mocker, count_calls, agent, bandit, simulation, run_params
     ):
-        agent_choose_spy = mocker.spy(agent, "choose")
-        bandit_play_spy = mocker.spy(bandit, "play")
+        variates = np.zeros(run_params["steps"])
+        bandit_sample = mocker.patch.object(bandit, "sample", return_value=variates)
+        mocker.patch.object(bandit, "play_sampled", return_value=1)
+        bandit_play = count_calls(bandit, "play")
         agent_update_spy = mocker.spy(agent, "update")
-        agent_stats_update_spy = mocker.spy(AgentStats, "update")
         simulation._run_trials_for_agent(agent, **run_params)
-        total_count = run_params["trials"] * run_params["steps"]
-        assert agent_choose_spy.call_count == total_count
-        assert bandit_play_spy.call_count == total_count
-        assert agent_update_spy.call_count == total_count
-        assert agent_stats_update_spy.call_count == total_count
+        assert bandit_sample.call_count == run_params["trials"]
+        assert bandit_play.call_count == 0
+        for call in agent_update_spy.call_args_list:
+            assert call.args[0] == 1
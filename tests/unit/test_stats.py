@@ -1,10 +1,12 @@
-import random
+import pickle
+import subprocess
+import sys
 from unittest.mock import patch
 
 import numpy as np
 import pytest
 
-from mabby import Bandit, Metric, Simulation
+from mabby import Agent, Bandit, Metric, Simulation
 from mabby.exceptions import StatsUsageError
 from mabby.stats import AgentStats, SimulationStats
 
@@ -57,10 +59,21 @@ class TestMetric:
         for metric in metrics:
             assert metric.base in base_metrics
 
+    def test_map_to_base_caches_results(self):
+        assert Metric.map_to_base(list(Metric)) is Metric.map_to_base(list(Metric))
+
     def test_transform_returns_values_for_base_metrics(self, mocker, base_metric):
         values = mocker.Mock()
         assert Metric.transform(base_metric, values) == values
 
+    @pytest.mark.parametrize("metric", list(Metric))
+    def test_transform_with_out_writes_transformed_values_in_place(self, metric):
+        values = np.arange(5, dtype=np.float64)
+        expected = metric.transform(values.copy())
+        transformed_values = metric.transform(values, out=values)
+        assert transformed_values is values
+        np.testing.assert_array_equal(transformed_values, expected)
+
     def test_transform_returns_transformed_values_for_non_base_metrics(
         self, mocker, non_base_metric
     ):
@@ -80,7 +93,7 @@ class TestAgentStats:
 
     @pytest.fixture
     def bandit(self, arm_factory, num_arms):
-        arms = [arm_factory.generic(mean=random.random()) for _ in range(num_arms)]
+        arms = [arm_factory.generic() for _ in range(num_arms)]
         return Bandit(arms=arms)
 
     @pytest.fixture(params=[10])
@@ -88,16 +101,16 @@ class TestAgentStats:
         return request.param
 
     @pytest.fixture
-    def step(self, steps):
-        return random.randint(0, steps - 1)
+    def step(self, fixture_rng, steps):
+        return int(fixture_rng.integers(steps))
 
     @pytest.fixture(params=[3])
     def num_arms(self, request):
         return request.param
 
     @pytest.fixture
-    def choice(self, num_arms):
-        return random.randint(0, num_arms - 1)
+    def choice(self, fixture_rng, num_arms):
+        return int(fixture_rng.integers(num_arms))
 
     @pytest.fixture
     def opt_choice(self, bandit):
@@ -120,6 +133,10 @@ class TestAgentStats:
         assert agent_stats._bandit == bandit
         assert agent_stats._steps == steps
 
+    def test_init_caches_bandit_means(self, agent_stats, bandit):
+        assert agent_stats._means is bandit.means
+        assert agent_stats._best_mean == bandit.max_mean
+
     def test_init_with_no_metrics_creates_correct_stats_dictionary(
         self, mocker, agent, bandit, steps
     ):
@@ -146,6 +163,23 @@ class TestAgentStats:
         for stat_values in agent_stats._stats.values():
             assert len(stat_values) == steps
 
+    def test_init_allocates_stats_in_one_contiguous_block(self, agent_stats, steps):
+        assert agent_stats._values.shape == (len(agent_stats._stats), steps)
+        assert agent_stats._values.flags.c_contiguous
+        for stat_values in agent_stats._stats.values():
+            assert np.shares_memory(stat_values, agent_stats._values)
+
+    def test_unpickled_stats_update_shared_block(
+        self, agent_stats, step, choice, reward
+    ):
+        agent_stats.update(step=step, choice=choice, reward=reward)
+        unpickled_stats = pickle.loads(pickle.dumps(agent_stats))
+        unpickled_stats.update(step=step, choice=choice, reward=reward)
+        for stat_values in unpickled_stats._stats.values():
+            assert np.shares_memory(stat_values, unpickled_stats._values)
+        assert unpickled_stats._stats[Metric.REWARDS][step] == 2 * reward
+        assert unpickled_stats._counts[step] == 2
+
     def test_len_returns_number_of_steps(self, agent_stats, steps):
         assert len(agent_stats) == steps
 
@@ -159,6 +193,23 @@ class TestAgentStats:
         transform_spy.assert_called_once()
         assert (stats == transform_spy.spy_return).all()
 
+    def test_getitem_reuses_averages_until_update(
+        self, agent_stats, step, choice, reward
+    ):
+        agent_stats.update(step=step, choice=choice, reward=reward)
+        rewards = agent_stats[Metric.REWARDS]
+        averages = agent_stats._averages
+        agent_stats[Metric.CUM_REWARDS]
+        assert agent_stats._averages is averages
+        agent_stats.update(step=step, choice=choice, reward=reward)
+        assert agent_stats._averages is None
+        np.testing.assert_array_equal(agent_stats[Metric.REWARDS], rewards)
+
+    def test_getitem_returns_independent_arrays(self, agent_stats, metric):
+        stats = agent_stats[metric]
+        stats[...] = 1
+        assert not (agent_stats[metric] == 1).any()
+
     def test_update_increments_count_for_step(self, agent_stats, step, choice, reward):
         original_count = agent_stats._counts[step]
         agent_stats.update(step=step, choice=choice, reward=reward)
@@ -175,16 +226,13 @@ class TestAgentStats:
 
     @pytest.mark.parametrize("metrics", [[Metric.CUM_REGRET], [Metric.REGRET]])
     def test_update_updates_regret_when_not_optimal(
-        self, mocker, agent, bandit, metrics, steps, step, non_opt_choice, reward
+        self, agent, bandit, metrics, steps, step, non_opt_choice, reward
     ):
-        regret_spy = mocker.spy(bandit, "regret")
         agent_stats = AgentStats(agent, bandit, steps, metrics)
         prev_regret = agent_stats._stats[Metric.REGRET][step]
         agent_stats.update(step=step, choice=non_opt_choice, reward=reward)
-        assert (
-            agent_stats._stats[Metric.REGRET][step]
-            == prev_regret + regret_spy.spy_return
-        )
+        regret = bandit.regret(non_opt_choice)
+        assert agent_stats._stats[Metric.REGRET][step] == prev_regret + regret
 
     @pytest.mark.parametrize("metrics", [[Metric.OPTIMALITY]])
     def test_update_increments_optimality_when_optimal(
@@ -215,6 +263,64 @@ class TestAgentStats:
         agent_stats.update(step=step, choice=choice, reward=reward)
         assert agent_stats._stats[Metric.REWARDS][step] == prev_rewards + reward
 
+    def test_update_trial_matches_update_for_each_step(
+        self, agent, bandit, steps, num_arms
+    ):
+        rng = np.random.default_rng(seed=41)
+        choices = rng.integers(num_arms, size=steps)
+        rewards = rng.random(steps)
+        agent_stats = AgentStats(agent, bandit, steps)
+        expected_stats = AgentStats(agent, bandit, steps)
+        agent_stats.update_trial(choices, rewards)
+        for step, (choice, reward) in enumerate(zip(choices, rewards)):
+            expected_stats.update(step, choice, reward)
+        np.testing.assert_array_equal(agent_stats._counts, expected_stats._counts)
+        for metric in BASE_METRICS:
+            np.testing.assert_allclose(
+                agent_stats._stats[metric], expected_stats._stats[metric]
+            )
+
+    @pytest.mark.parametrize("metrics", [None, [Metric.CUM_REGRET, Metric.REWARDS]])
+    def test_update_batch_matches_update_for_each_step(
+        self, agent, bandit, steps, num_arms, metrics
+    ):
+        rng = np.random.default_rng(seed=73)
+        batch_steps = rng.integers(steps, size=4 * steps)
+        choices = rng.integers(num_arms, size=4 * steps)
+        rewards = rng.random(4 * steps)
+        agent_stats = AgentStats(agent, bandit, steps, metrics)
+        expected_stats = AgentStats(agent, bandit, steps, metrics)
+        agent_stats.update_batch(batch_steps, choices, rewards)
+        for step, choice, reward in zip(batch_steps, choices, rewards):
+            expected_stats.update(step, choice, reward)
+        np.testing.assert_array_equal(agent_stats._counts, expected_stats._counts)
+        np.testing.assert_allclose(agent_stats._values, expected_stats._values)
+
+    def test_update_batch_accumulates_repeated_steps(
+        self, agent_stats, step, choice, reward
+    ):
+        steps, choices = np.array([step, step]), np.array([choice, choice])
+        agent_stats.update_batch(steps, choices, np.array([reward, reward]))
+        assert agent_stats._counts[step] == agent_stats._counts.sum() == 2
+        assert agent_stats._stats[Metric.REWARDS][step] == 2 * reward
+
+    def test_merge_adds_stats_and_counts(
+        self, agent, bandit, steps, step, choice, reward
+    ):
+        agent_stats = AgentStats(agent, bandit, steps)
+        other_stats = AgentStats(agent, bandit, steps)
+        agent_stats.update(step=step, choice=choice, reward=reward)
+        other_stats.update(step=step, choice=choice, reward=reward)
+        agent_stats.merge(other_stats)
+        assert agent_stats._counts[step] == 2
+        assert agent_stats._stats[Metric.REWARDS][step] == 2 * reward
+
+    def test_merge_with_different_metrics_raises_error(self, agent, bandit, steps):
+        agent_stats = AgentStats(agent, bandit, steps, [Metric.REGRET])
+        other_stats = AgentStats(agent, bandit, steps, [Metric.REWARDS])
+        with pytest.raises(StatsUsageError):
+            agent_stats.merge(other_stats)
+
 
 class TestSimulationStats:
     @pytest.fixture(autouse=True)
@@ -226,12 +332,12 @@ class TestSimulationStats:
         return [agent_factory.generic() for _ in range(request.param)]
 
     @pytest.fixture
-    def agent(self, agents):
-        return random.choice(agents)
+    def agent(self, fixture_rng, agents):
+        return agents[fixture_rng.integers(len(agents))]
 
     @pytest.fixture(params=[3])
     def bandit(self, request, arm_factory):
-        arms = [arm_factory.generic(mean=random.random()) for _ in range(request.param)]
+        arms = [arm_factory.generic() for _ in range(request.param)]
         return Bandit(arms=arms)
 
     @pytest.fixture
@@ -267,6 +373,7 @@ class TestSimulationStats:
     def test_add_puts_agent_stats_in_stats_dict(self, sim_stats, agent, agent_stats):
         sim_stats.add(agent_stats)
         assert sim_stats._stats_dict[agent] == agent_stats
+        assert sim_stats._labels[agent] == str(agent)
 
     def test_getitem_returns_agent_stats_of_agent(self, sim_stats, agent, agent_stats):
         sim_stats._stats_dict[agent] = agent_stats
@@ -277,11 +384,12 @@ class TestSimulationStats:
     ):
         sim_stats[agent] = agent_stats
         assert sim_stats._stats_dict[agent] == agent_stats
+        assert sim_stats._labels[agent] == str(agent)
 
     def test_setitem_raises_error_with_non_matching_agent(
         self, sim_stats, agent, agents, agent_stats
     ):
-        other_agent = random.choice(list(filter(lambda b: b != agent, agents)))
+        other_agent = next(a for a in agents if a != agent)
         with pytest.raises(StatsUsageError):
             sim_stats[other_agent] = agent_stats
 
@@ -306,6 +414,27 @@ class TestSimulationStats:
             np.testing.assert_array_equal(agent_stats[metric], calls[i][0][0])
             assert calls[i][1]["label"] == str(agent)
 
+    @pytest.mark.parametrize("num_agents", [1, 3])
+    def test_plot_labels_each_line_with_agent_name(
+        self, strategy_factory, bandit, steps, metric, num_agents
+    ):
+        from matplotlib import pyplot as plt
+
+        agents = [
+            Agent(strategy=strategy_factory.generic(), name=f"agent-{i}")
+            for i in range(num_agents)
+        ]
+        sim_stats = SimulationStats(Simulation(agents=agents, bandit=bandit))
+        for agent in agents:
+            sim_stats.add(AgentStats(agent, bandit, steps))
+        plt.figure()
+        try:
+            sim_stats.plot(metric=metric)
+            labels = [line.get_label() for line in plt.gca().get_lines()]
+        finally:
+            plt.close()
+        assert labels == [str(agent) for agent in agents]
+
     def test_plot_regret_invokes_plot_when_cumulative_is_true(
         self, plot_spy, filled_sim_stats
     ):
@@ -333,3 +462,8 @@ class TestSimulationStats:
     ):
         filled_sim_stats.plot_rewards(cumulative=False)
         plot_spy.assert_called_once_with(Metric.REWARDS)
+
+
+def test_import_does_not_import_matplotlib():
+    code = "import sys, mabby; assert 'matplotlib.pyplot' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -1,8 +1,5 @@
-from unittest.mock import patch
-
 import numpy as np
 import pytest
-from numpy.random import Generator
 
 from mabby import Agent
 from mabby.exceptions import StrategyUsageError
@@ -17,16 +14,36 @@ from mabby.strategies import (
 )
 
 
+class StubBetaRng:
+    def __init__(self, samples):
+        self.samples = samples
+        self.calls = []
+
+    def beta(self, a, b):
+        self.calls.append((a, b))
+        return self.samples
+
+
+def assert_zero_Qs_and_Ns(strategy, k):
+    for values in (strategy._Qs, strategy._Ns):
+        assert isinstance(values, np.ndarray)
+        assert len(values) == k
+        assert not values.any()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patch_abstract_methods(unabstract):
+    with unabstract(Strategy), unabstract(SemiUniformStrategy):
+        yield
+
+
 class TestStrategy:
     STRATEGY_CLASS = Strategy
 
-    @pytest.fixture(autouse=True)
-    def patch_abstract_methods(self, mocker):
-        mocker.patch.object(Strategy, "__abstractmethods__", set())
-
     @pytest.fixture
-    def mock_rng(self, mocker):
-        return mocker.Mock(spec=Generator, random=lambda: 0.5, choice=lambda xs: xs[0])
+    def mock_rng(self, mock_rng):
+        mock_rng.configure_mock(random=lambda: 0.5, choice=lambda xs: xs[0])
+        return mock_rng
 
     @pytest.fixture(params=[{}])
     def valid_params(self, request):
@@ -71,13 +88,14 @@ class TestStrategy:
         assert agent._name == name
 
 
+def test_strategy_cannot_load_state_by_default():
+    with pytest.raises(NotImplementedError):
+        Strategy().load_state(Strategy())
+
+
 class TestSemiUniformStrategy(TestStrategy):
     STRATEGY_CLASS = SemiUniformStrategy
 
-    @pytest.fixture(autouse=True)
-    def patch_abstract_methods(self, mocker):
-        mocker.patch.object(SemiUniformStrategy, "__abstractmethods__", set())
-
     @pytest.fixture(params=[{}])
     def valid_params(self, request):
         return request.param
@@ -89,19 +107,14 @@ class TestSemiUniformStrategy(TestStrategy):
 
     @pytest.fixture(params=[[0.1, 0.5, 0.2], [2, 0]])
     def Qs(self, request):
-        return request.param
+        return np.array(request.param, dtype=np.float64)
 
     @pytest.fixture(params=[[1, 1, 1]])
     def Ns(self, request):
-        return request.param
+        return np.array(request.param, dtype=np.uint32)
 
     def test_prime_inits_Qs_and_Ns(self, prime_params, primed_strategy):
-        assert isinstance(primed_strategy._Qs, np.ndarray)
-        assert isinstance(primed_strategy._Ns, np.ndarray)
-        assert len(primed_strategy._Qs) == prime_params["k"]
-        assert len(primed_strategy._Ns) == prime_params["k"]
-        assert not primed_strategy._Qs.any()
-        assert not primed_strategy._Ns.any()
+        assert_zero_Qs_and_Ns(primed_strategy, prime_params["k"])
 
     def test_choose_with_low_rng_explores(
         self, mocker, mock_rng, effective_eps, prime_params, primed_strategy
@@ -131,34 +144,65 @@ class TestSemiUniformStrategy(TestStrategy):
     def test_update_updates_Qs_and_Ns(
         self, prime_params, primed_strategy, choice, reward
     ):
-        primed_strategy._Ns = np.ones(prime_params["k"])
+        primed_strategy._Ns = np.ones(prime_params["k"], dtype=np.uint32)
         primed_strategy.update(choice, reward)
         assert primed_strategy._Qs[choice] == reward / 2
         assert primed_strategy._Ns[choice] == 2
-        assert sum(primed_strategy._Ns) == prime_params["k"] + 1
+        assert primed_strategy._Ns.sum() == prime_params["k"] + 1
 
     def test_Qs_returns_Qs(self, primed_strategy, Qs):
         primed_strategy._Qs = Qs
-        assert primed_strategy.Qs == Qs
+        assert primed_strategy.Qs is Qs
 
     def test_Ns_returns_Ns(self, primed_strategy, Ns):
         primed_strategy._Ns = Ns
-        assert primed_strategy.Ns == Ns
+        assert primed_strategy.Ns is Ns
+
+    def test_load_state_copies_Qs_and_Ns(
+        self, valid_params, prime_params, primed_strategy, Qs, Ns
+    ):
+        other = self.STRATEGY_CLASS(**valid_params)
+        other.prime(**prime_params)
+        other._Qs, other._Ns = Qs, Ns
+        primed_strategy.load_state(other)
+        np.testing.assert_array_equal(primed_strategy.Qs, Qs)
+        np.testing.assert_array_equal(primed_strategy.Ns, Ns)
+        assert primed_strategy.Qs is not Qs and primed_strategy.Ns is not Ns
+
+    def test_load_state_from_other_strategy_type_raises_error(self, primed_strategy):
+        other = UCB1Strategy(alpha=0.5)
+        with pytest.raises(StrategyUsageError):
+            primed_strategy.load_state(other)
 
 
 class TestRandomStrategy(TestSemiUniformStrategy):
     STRATEGY_CLASS = RandomStrategy
 
-    @pytest.fixture(params=[{}])
-    def valid_params(self, request):
-        return request.param
-
     def test_repr_equals_random(self, strategy):
         assert repr(strategy) == "random"
 
     def test_effective_eps_equals_1(self, strategy):
         assert strategy.effective_eps() == 1
 
+    # the random strategy never exploits, so the inherited test is replaced by
+    # test_choose_with_high_rng_explores (pytest does not collect a None attribute)
+    test_choose_with_high_rng_exploits = None
+
+    def test_choose_with_high_rng_explores(self, mocker, mock_rng, primed_strategy):
+        mocker.patch.object(mock_rng, "random", return_value=0.99)
+        explore = mocker.spy(primed_strategy, "_explore")
+        exploit = mocker.spy(primed_strategy, "_exploit")
+        primed_strategy.choose(mock_rng)
+        explore.assert_called_once_with(mock_rng)
+        exploit.assert_not_called()
+
+    def test_choose_explores_without_drawing(self, mocker, mock_rng, primed_strategy):
+        random = mocker.patch.object(mock_rng, "random", return_value=0.5)
+        explore = mocker.spy(primed_strategy, "_explore")
+        primed_strategy.choose(mock_rng)
+        explore.assert_called_once_with(mock_rng)
+        random.assert_not_called()
+
 
 class TestEpsilonGreedyStrategy(TestSemiUniformStrategy):
     STRATEGY_CLASS = EpsilonGreedyStrategy
@@ -210,6 +254,17 @@ class TestEpsilonFirstStrategy(TestSemiUniformStrategy):
             assert primed_strategy.effective_eps() == 0
             primed_strategy.update(choice, reward)
 
+    def test_load_state_copies_explore_steps_remaining(
+        self, valid_params, prime_params, primed_strategy, choice, reward
+    ):
+        other = self.STRATEGY_CLASS(**valid_params)
+        other.prime(**prime_params)
+        other.update(choice, reward)
+        primed_strategy.load_state(other)
+        assert (
+            primed_strategy._explore_steps_remaining == other._explore_steps_remaining
+        )
+
 
 class TestUCB1Strategy(TestStrategy):
     STRATEGY_CLASS = UCB1Strategy
@@ -224,7 +279,8 @@ class TestUCB1Strategy(TestStrategy):
 
     @pytest.fixture(params=[([0.1, 0.5, 0.2], [1, 1, 1]), ([2, 5], [10, 3])])
     def Qs_Ns(self, request):
-        return request.param
+        Qs, Ns = request.param
+        return np.array(Qs, dtype=np.float64), np.array(Ns, dtype=np.uint32)
 
     def test_init_sets_alpha(self, valid_params, strategy):
         assert strategy.alpha == valid_params["alpha"]
@@ -236,19 +292,15 @@ class TestUCB1Strategy(TestStrategy):
         assert primed_strategy._t == 0
 
     def test_prime_inits_Qs_and_Ns(self, prime_params, primed_strategy):
-        assert isinstance(primed_strategy._Qs, np.ndarray)
-        assert isinstance(primed_strategy._Ns, np.ndarray)
-        assert len(primed_strategy._Qs) == prime_params["k"]
-        assert len(primed_strategy._Ns) == prime_params["k"]
-        assert not primed_strategy._Qs.any()
-        assert not primed_strategy._Ns.any()
+        assert_zero_Qs_and_Ns(primed_strategy, prime_params["k"])
 
     @pytest.mark.parametrize("UCBs", [[0.1, 0.5, 0.3]])
     def test_choose_returns_UCB_argmax_when_t_greater_than_k(
         self, mocker, mock_rng, prime_params, primed_strategy, UCBs
     ):
-        mocker.patch.object(primed_strategy, "_compute_UCBs", return_value=UCBs)
-        compute_UCBs = mocker.spy(primed_strategy, "_compute_UCBs")
+        compute_UCBs = mocker.patch.object(
+            primed_strategy, "_compute_UCBs", return_value=UCBs
+        )
         primed_strategy._t = prime_params["k"]
         choice = primed_strategy.choose(mock_rng)
         compute_UCBs.assert_called_once()
@@ -278,20 +330,37 @@ class TestUCB1Strategy(TestStrategy):
         self, prime_params, primed_strategy, choice, reward
     ):
         primed_strategy._t = prime_params["k"]
-        primed_strategy._Ns = np.ones(prime_params["k"])
+        primed_strategy._Ns = np.ones(prime_params["k"], dtype=np.uint32)
         primed_strategy.update(choice, reward)
         assert primed_strategy._Qs[choice] == reward / 2
         assert primed_strategy._Ns[choice] == 2
-        assert sum(primed_strategy._Ns) == prime_params["k"] + 1
+        assert primed_strategy._Ns.sum() == prime_params["k"] + 1
         assert primed_strategy._t == prime_params["k"] + 1
 
     def test_Qs_returns_Qs(self, primed_strategy, Qs_Ns):
         primed_strategy._Qs = Qs_Ns[0]
-        assert primed_strategy.Qs == Qs_Ns[0]
+        assert primed_strategy.Qs is Qs_Ns[0]
 
     def test_Ns_returns_Ns(self, primed_strategy, Qs_Ns):
         primed_strategy._Ns = Qs_Ns[1]
-        assert primed_strategy.Ns == Qs_Ns[1]
+        assert primed_strategy.Ns is Qs_Ns[1]
+
+    def test_load_state_copies_t_Qs_and_Ns(
+        self, valid_params, prime_params, primed_strategy, Qs_Ns
+    ):
+        other = self.STRATEGY_CLASS(**valid_params)
+        other.prime(**prime_params)
+        other._Qs, other._Ns = Qs_Ns
+        other._t = int(Qs_Ns[1].sum())
+        primed_strategy.load_state(other)
+        assert primed_strategy._t == other._t
+        np.testing.assert_array_equal(primed_strategy.Qs, Qs_Ns[0])
+        np.testing.assert_array_equal(primed_strategy.Ns, Qs_Ns[1])
+        assert primed_strategy.Qs is not Qs_Ns[0]
+
+    def test_load_state_from_other_strategy_type_raises_error(self, primed_strategy):
+        with pytest.raises(StrategyUsageError):
+            primed_strategy.load_state(BetaTSStrategy())
 
 
 class TestBetaTSStrategy(TestStrategy):
@@ -303,7 +372,8 @@ class TestBetaTSStrategy(TestStrategy):
 
     @pytest.fixture(params=[([1, 4, 2], [2, 3, 1]), ([2, 6], [5, 3])])
     def a_b(self, request):
-        return request.param
+        a, b = request.param
+        return np.array(a, dtype=np.float64), np.array(b, dtype=np.float64)
 
     def test_init_sets_general(self, valid_params, strategy):
         assert strategy.general == valid_params["general"]
@@ -318,13 +388,12 @@ class TestBetaTSStrategy(TestStrategy):
         assert len(primed_strategy._b) == prime_params["k"]
 
     @pytest.mark.parametrize("beta_samples", [[0.1, 0.5, 0.3]])
-    def test_choose_returns_beta_samples_argmax(
-        self, mock_rng, primed_strategy, beta_samples
-    ):
-        with patch.object(mock_rng, "beta", return_value=beta_samples) as beta:
-            choice = primed_strategy.choose(mock_rng)
-            beta.assert_called_once_with(a=primed_strategy._a, b=primed_strategy._b)
-            assert beta.return_value[choice] == max(beta.return_value)
+    def test_choose_returns_beta_samples_argmax(self, primed_strategy, beta_samples):
+        rng = StubBetaRng(beta_samples)
+        choice = primed_strategy.choose(rng)
+        ((a, b),) = rng.calls
+        assert a is primed_strategy._a and b is primed_strategy._b
+        assert beta_samples[choice] == max(beta_samples)
 
     def test_update_increments_a_when_reward_is_1(
         self, mocker, mock_rng, primed_strategy, choice
@@ -344,34 +413,43 @@ class TestBetaTSStrategy(TestStrategy):
         assert primed_strategy._a[choice] == prev_a
         assert primed_strategy._b[choice] == prev_b + 1
 
-    @pytest.mark.parametrize("invalid_reward", [-0.2, 1.3])
-    def test_update_with_invalid_reward_for_general_strategy_raises_error(
-        self, mock_rng, prime_params, choice, invalid_reward
-    ):
-        strategy = self.STRATEGY_CLASS(general=True)
-        strategy.prime(**prime_params)
-        with pytest.raises(StrategyUsageError):
-            strategy.update(choice, invalid_reward, mock_rng)
-
-    @pytest.mark.parametrize("invalid_reward", [-2, 0.4, 1.2])
-    def test_update_with_invalid_reward_for_non_general_strategy_raises_error(
-        self, mock_rng, prime_params, choice, invalid_reward
+    @pytest.mark.parametrize(
+        "general,invalid_reward",
+        [(True, -0.2), (True, 1.3), (False, -2), (False, 0.4), (False, 1.2)],
+    )
+    def test_update_with_invalid_reward_raises_error(
+        self, fixture_rng, prime_params, choice, general, invalid_reward
     ):
-        strategy = self.STRATEGY_CLASS(general=False)
+        strategy = self.STRATEGY_CLASS(general=general)
         strategy.prime(**prime_params)
         with pytest.raises(StrategyUsageError):
-            strategy.update(choice, invalid_reward, mock_rng)
+            strategy.update(choice, invalid_reward, fixture_rng)
 
     def test_update_without_rng_raises_error(self, primed_strategy, choice, reward):
         with pytest.raises(StrategyUsageError):
             primed_strategy.update(choice, reward)
 
     def test_Qs_returns_beta_mean(self, primed_strategy, a_b):
-        a, b = np.array(a_b[0]), np.array(a_b[1])
+        a, b = a_b
         primed_strategy._a, primed_strategy._b = a, b
         np.testing.assert_array_equal(primed_strategy.Qs, a / (a + b))
 
     def test_Ns_returns_counts(self, primed_strategy, a_b):
-        a, b = np.array(a_b[0]), np.array(a_b[1])
+        a, b = a_b
         primed_strategy._a, primed_strategy._b = a, b
         np.testing.assert_array_equal(primed_strategy.Ns, a + b - 2)
+
+    def test_load_state_copies_a_and_b(
+        self, valid_params, prime_params, primed_strategy, a_b
+    ):
+        other = self.STRATEGY_CLASS(**valid_params)
+        other.prime(**prime_params)
+        other._a, other._b = a_b
+        primed_strategy.load_state(other)
+        np.testing.assert_array_equal(primed_strategy._a, a_b[0])
+        np.testing.assert_array_equal(primed_strategy._b, a_b[1])
+        assert primed_strategy._a is not a_b[0]
+
+    def test_load_state_from_other_strategy_type_raises_error(self, primed_strategy):
+        with pytest.raises(StrategyUsageError):
+            primed_strategy.load_state(UCB1Strategy(alpha=0.5))
@@ -1,7 +1,10 @@
 import numpy as np
 import pytest
 
-from mabby.utils import random_argmax
+from mabby.utils import random_argmax, spawn_rngs
+
+# chi-square critical values at the 1% significance level by degrees of freedom
+CHI2_CRITICAL_VALUES = {1: 6.635, 2: 9.210, 3: 11.345}
 
 
 @pytest.fixture
@@ -9,15 +12,40 @@ def rng():
     return np.random.default_rng(83271)
 
 
-@pytest.mark.parametrize("values", [[3, 10, -2, 10]])
+@pytest.mark.parametrize("values", [[3, 10, -2, 10], [1, 7, 7, 0], [5, 5, 5, 5]])
 def test_random_argmax_returns_argmax(values, rng):
     assert values[random_argmax(values, rng=rng)] == max(values)
 
 
 @pytest.mark.parametrize("values", [[3, 10, -2, 10]])
 def test_random_argmax_with_rng_produces_even_distribution(values, rng):
-    all_argmax = np.where(values == np.max(values))[0]
+    is_max = np.equal(values, np.max(values))
     argmax_samples = [random_argmax(values, rng=rng) for _ in range(100)]
-    values, counts = np.unique(argmax_samples, return_counts=True)
-    assert len(values) == len(all_argmax)
-    assert np.allclose(counts, np.mean(counts), rtol=0.05)
+    counts = np.bincount(argmax_samples, minlength=len(values))
+    assert not counts[~is_max].any()
+    expected = len(argmax_samples) / is_max.sum()
+    chi2 = ((counts[is_max] - expected) ** 2 / expected).sum()
+    assert chi2 < CHI2_CRITICAL_VALUES[is_max.sum() - 1]
+
+
+@pytest.mark.parametrize("values", [[3, 10, -2, 7]])
+def test_random_argmax_with_unique_max_does_not_draw(mocker, values):
+    rng = mocker.Mock(spec=np.random.Generator)
+    assert random_argmax(values, rng=rng) == 1
+    rng.choice.assert_not_called()
+
+
+@pytest.mark.parametrize("n", [3])
+def test_spawn_rngs_returns_independent_generators(rng, n):
+    children = spawn_rngs(rng, n)
+    assert len(children) == n
+    samples = [child.random(5) for child in children]
+    assert len({tuple(sample) for sample in samples}) == n
+
+
+@pytest.mark.parametrize("n", [3])
+def test_spawn_rngs_is_reproducible_from_seed(n):
+    first = spawn_rngs(np.random.default_rng(17), n)
+    second = spawn_rngs(np.random.default_rng(17), n)
+    for a, b in zip(first, second):
+        assert a.random() == b.random()